@@ -9,14 +9,60 @@ The application opens as a popup window and logs all data to a text file for ana
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
 import threading
+import queue
+import array
 import os
+import time
 from datetime import datetime
 from pathlib import Path
 import json
+from functools import partial
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Optional
 import winsound
 
+try:
+    import orjson  # Optional: faster JSON serialization of the session records
+except ImportError:
+    orjson = None
+
+
+# Session log header, filled from the TestSession and written in one call
+_LOG_HEADER_TEMPLATE = (
+    "{rule}\n"
+    "MOCK TEST QUESTION TIMER - SESSION LOG\n"
+    "{rule}\n\n"
+    "Test Description: {session.test_description}\n"
+    "Session ID: {session.session_id}\n"
+    "Started: {session.created_at}\n"
+    "Maximum Time per Question: {session.max_time_per_question} minutes\n"
+    "Total Test Duration: {session.total_duration_minutes} minutes\n"
+    "\n{rule}\n"
+    "QUESTION DETAILS\n"
+    "{rule}\n\n"
+)
+
+# Zero-padded "00".."99" lookup so per-tick MM:SS formatting is plain string concatenation
+_TWO_DIGIT = tuple(f"{i:02d}" for i in range(100))
+
+# Every MM:SS string from 00:00 to 99:59, so typical timer values are a single index
+_MMSS = tuple(_TWO_DIGIT[s // 60] + ":" + _TWO_DIGIT[s % 60] for s in range(6000))
+
+
+def _format_mmss(total_seconds):
+    """Format a number of seconds as MM:SS (minutes grow past two digits when needed)"""
+    if total_seconds < 6000:
+        return _MMSS[total_seconds]
+    minutes, seconds = divmod(total_seconds, 60)
+    return str(minutes) + ":" + _TWO_DIGIT[seconds]
+
+
+def _dumps_records(records):
+    """Serialize a list of record dicts to one compact JSON line"""
+    if orjson is not None:
+        return orjson.dumps(records, option=orjson.OPT_APPEND_NEWLINE).decode("utf-8")
+    return json.dumps(records, separators=(",", ":"), ensure_ascii=False) + "\n"
+
 
 @dataclass
 class TimeCategory:
@@ -41,9 +87,9 @@ class QuestionRecord:
     """Represents a single question record"""
     session_id: str
     question_number: int
-    time_category: str
-    allocated_time: int
-    actual_time: int
+    time_category: str  # Comma-separated selected categories, "" when none
+    allocated_time: int  # Seconds
+    actual_time: int  # Seconds
     timestamp: str
     theme: str
     notes: str
@@ -52,6 +98,19 @@ class QuestionRecord:
 class MockTestTimerGUI:
     """Main GUI application for mock test timer"""
     
+    # Question blocks are only built near the viewport, at fixed-height slots
+    BLOCK_HEIGHT = 170
+    BLOCK_MARGIN = 5
+    
+    _CATEGORIES = ("Thinking", "Solving", "Applying", "Verification")
+    _CATEGORY_COLORS = {
+        "Thinking": "#FF6B6B",
+        "Solving": "#4ECDC4",
+        "Applying": "#45B7D1",
+        "Verification": "#FFA07A"
+    }
+    _TEMPLATES = ("Maths", "Chemistry", "Physics", "Biology", "History")
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Mock Test Question Timer")
@@ -63,23 +122,55 @@ class MockTestTimerGUI:
         self.time_categories = []
         self.question_records = []
         self.csv_file = None
+        self.text_file = None
+        self._log_fh = None  # Session log handle, kept open for the whole session
         self.current_theme = tk.StringVar(value="Light")
         self.current_question_num = 1
         self.mini_window = None
         self.mini_window_timer_label = None
         self.floating_window_category_vars = {}
+        self.floating_window_category_buttons = {}
+        self.questions_canvas = None
         
         # Timer
-        self.timer_running = False
-        self.elapsed_seconds = 0
-        self.timer_thread = None
         self.session_elapsed_seconds = 0
-        self.session_timer_running = False
+        self._session_running = False
+        self._active_q = None  # Question whose timer is currently running
+        self._total_deadline_sec = 0
+        self._max_seconds = 0  # Per-question time limit in seconds
+        # Per-question timer state as flat arrays indexed by question number (slot 0 unused)
+        self._elapsed = array.array('i', [0] * 76)
+        self._beeped = bytearray(76)
+        self._q_t0 = array.array('d', [0.0] * 76)  # monotonic() at which each question's timer would read 0
+        self._q_paused_at = array.array('d', [0.0] * 76)  # monotonic() at which each question was last paused
+        self._session_t0 = 0.0
+        self._tick_id = None  # Pending after() id of the tick
+        self._block_refresh_id = None  # Pending after_idle() id of the question block refresh
+        self._after_ids = []  # Other pending after() ids, cancelled on session teardown
+        self._total_elapsed_seconds = 0  # Running total of elapsed seconds across all questions
+        
+        # Beeps are played on a background thread so winsound.Beep never blocks the Tk loop
+        self._beep_q = queue.Queue()
+        threading.Thread(target=self._beep_worker, daemon=True).start()
+        
+        # Enable mouse scroll (bound once; the handler ignores it when no question list is shown)
+        self.root.bind_all("<MouseWheel>", self.on_mousewheel)
+        self.root.bind_all("<Button-4>", self.on_mousewheel)
+        self.root.bind_all("<Button-5>", self.on_mousewheel)
         
         # Initialize UI
         self.setup_themes()
         self.show_initial_setup()
         
+    def _beep_worker(self):
+        """Play queued (frequency, duration) beeps off the UI thread"""
+        while True:
+            freq, dur = self._beep_q.get()
+            try:
+                winsound.Beep(freq, dur)
+            except:
+                pass
+    
     def setup_themes(self):
         """Setup different themes for the GUI"""
         self.themes = {
@@ -105,11 +196,13 @@ class MockTestTimerGUI:
                 "accent": "#005a9c"
             }
         }
+        # Resolved colors for the current theme; refreshed by apply_theme
+        self._theme = self.themes.get(self.current_theme.get(), self.themes["Light"])
         
     def apply_theme(self, theme_name):
         """Apply selected theme to the entire GUI"""
-        theme = self.themes.get(theme_name, self.themes["Light"])
-        self.root.configure(bg=theme["bg"])
+        self._theme = self.themes.get(theme_name, self.themes["Light"])
+        self.root.configure(bg=self._theme["bg"])
         self.current_theme.set(theme_name)
         
     def show_initial_setup(self):
@@ -117,7 +210,7 @@ class MockTestTimerGUI:
         self.clear_window()
         
         # Get current theme colors
-        theme = self.themes.get(self.current_theme.get(), self.themes["Light"])
+        theme = self._theme
         
         # Header
         header = tk.Label(
@@ -214,7 +307,7 @@ class MockTestTimerGUI:
                 text=theme_name,
                 variable=self.current_theme,
                 value=theme_name,
-                command=lambda t=theme_name: self.apply_theme(t)
+                command=partial(self.apply_theme, theme_name)
             ).pack(side="left", padx=10)
         
         # Start Button
@@ -235,6 +328,7 @@ class MockTestTimerGUI:
     
     def start_session(self):
         """Start a new test session"""
+        self._cancel_pending()
         test_desc = self.test_desc_var.get().strip()
         
         if not test_desc:
@@ -258,12 +352,16 @@ class MockTestTimerGUI:
             total_duration_minutes=total_minutes
         )
         
+        self._total_deadline_sec = total_minutes * 60
+        self._max_seconds = int(self.current_session.max_time_per_question * 60)
+        
         # Setup text file for logging
         self.setup_text_file()
         
         # Start session timer
         self.session_elapsed_seconds = 0
-        self.session_timer_running = True
+        self._active_q = None
+        self._total_elapsed_seconds = 0
         self.start_session_timer()
         
         # Show 75 questions interface
@@ -277,26 +375,26 @@ class MockTestTimerGUI:
         filename = f"mock_test_{self.current_session.session_id}.txt"
         self.text_file = log_dir / filename
         
-        # Write header
-        with open(self.text_file, 'w') as f:
-            f.write("="*80 + "\n")
-            f.write("MOCK TEST QUESTION TIMER - SESSION LOG\n")
-            f.write("="*80 + "\n\n")
-            f.write(f"Test Description: {self.current_session.test_description}\n")
-            f.write(f"Session ID: {self.current_session.session_id}\n")
-            f.write(f"Started: {self.current_session.created_at}\n")
-            f.write(f"Maximum Time per Question: {self.current_session.max_time_per_question} minutes\n")
-            f.write(f"Total Test Duration: {self.current_session.total_duration_minutes} minutes\n")
-            f.write("\n" + "="*80 + "\n")
-            f.write("QUESTION DETAILS\n")
-            f.write("="*80 + "\n\n")
+        # Keep one buffered handle open for the session instead of reopening per write
+        self.close_log()
+        self._log_fh = open(self.text_file, 'w', buffering=65536)
+        
+        # Write header, flushed right away so the file is not empty if the app dies mid-session
+        self._log_fh.write(_LOG_HEADER_TEMPLATE.format(rule="="*80, session=self.current_session))
+        self._log_fh.flush()
+    
+    def close_log(self):
+        """Flush and close the session log file"""
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
     
     def show_75_questions_interface(self):
         """Show interface for 75 questions with category checklist"""
         self.clear_window()
         
         # Get current theme colors
-        theme = self.themes.get(self.current_theme.get(), self.themes["Light"])
+        theme = self._theme
         self.root.configure(bg=theme["bg"])
         
         # Header
@@ -345,9 +443,13 @@ class MockTestTimerGUI:
             fg=theme["button_fg"]
         ).pack(side="left", padx=5)
         
+        # Shared by the miniature form and the floating window so one set() updates both
+        self._mini_timer_var = tk.StringVar(value="00:00")
+        self._mini_total_var = tk.StringVar(value="00:00")
+        
         self.mini_timer_label = tk.Label(
             mini_left,
-            text="00:00",
+            textvariable=self._mini_timer_var,
             font=("Arial", 10, "bold"),
             bg=theme["button_bg"],
             fg=theme["button_fg"]
@@ -381,7 +483,7 @@ class MockTestTimerGUI:
         
         self.mini_total_time_label = tk.Label(
             mini_left,
-            text="00:00",
+            textvariable=self._mini_total_var,
             font=("Arial", 10, "bold"),
             bg=theme["button_bg"],
             fg="#FF6B6B"
@@ -394,34 +496,38 @@ class MockTestTimerGUI:
         
         self.questions_canvas = tk.Canvas(canvas_frame, bg=theme["bg"], highlightthickness=0)
         scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=self.questions_canvas.yview)
-        scrollable_frame = tk.Frame(self.questions_canvas, bg=theme["bg"])
         
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.questions_canvas.configure(scrollregion=self.questions_canvas.bbox("all"))
-        )
+        def on_questions_scroll(first, last):
+            scrollbar.set(first, last)
+            self.schedule_block_refresh()
         
-        self.questions_canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        self.questions_canvas.configure(yscrollcommand=scrollbar.set)
+        # Blocks sit at fixed offsets, so the scroll region is known without building them
+        self.questions_canvas.configure(
+            scrollregion=(0, 0, 0, 75 * self.BLOCK_HEIGHT),
+            yscrollcommand=on_questions_scroll
+        )
+        self.questions_canvas.bind("<Configure>", self.on_questions_canvas_configure)
         
-        # Store question widgets for later access
+        # Question state is plain Python data; widgets only exist for blocks near the viewport
         self.question_widgets = {}
         self.question_data = {}
-        
-        # Create 75 question blocks
         for q_num in range(1, 76):
-            self.create_question_block(scrollable_frame, q_num, theme)
+            self.question_data[q_num] = {
+                "categories": dict.fromkeys(self._CATEGORIES, False),
+                "notes": "",
+                "time_spent": "0"
+            }
+        self._elapsed = array.array('i', [0] * 76)
+        self._beeped = bytearray(76)
+        self._q_t0 = array.array('d', [0.0] * 76)
+        self._q_paused_at = array.array('d', [0.0] * 76)
         
         self.questions_canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Enable mouse scroll
-        self.questions_canvas.bind_all("<MouseWheel>", lambda e: self.on_mousewheel(e))
-        self.questions_canvas.bind_all("<Button-4>", lambda e: self.on_mousewheel(e))
-        self.questions_canvas.bind_all("<Button-5>", lambda e: self.on_mousewheel(e))
-        
         # Initialize miniature form
         self.update_miniature_form(1)
+        self.refresh_visible_blocks()
         
         # Footer buttons
         footer_frame = tk.Frame(self.root, bg=theme["bg"])
@@ -446,21 +552,78 @@ class MockTestTimerGUI:
         ).pack(side="left", padx=5)
         
         # Auto-launch floating window and start timer for question 1 when session starts
-        self.root.after(500, lambda: self.start_question_timer(1))
-        self.root.after(600, self.open_floating_window)
+        self._after_ids.append(self.root.after(500, self.start_question_timer, 1))
+        self._after_ids.append(self.root.after(600, self.open_floating_window))
+    
+    def on_questions_canvas_configure(self, event):
+        """Stretch question blocks to the canvas width and re-check which are visible"""
+        self.questions_canvas.itemconfigure("question_block", width=event.width - 10)
+        self.schedule_block_refresh()
+    
+    def schedule_block_refresh(self):
+        """Coalesce bursts of scroll/resize events into one refresh when Tk goes idle"""
+        if self._block_refresh_id is None:
+            self._block_refresh_id = self.root.after_idle(self._run_block_refresh)
+    
+    def _run_block_refresh(self):
+        self._block_refresh_id = None
+        if self.questions_canvas and self.questions_canvas.winfo_exists():
+            self.refresh_visible_blocks()
+    
+    def refresh_visible_blocks(self):
+        """Build question blocks inside the visible range (plus a margin) and destroy the rest"""
+        first, last = self.questions_canvas.yview()
+        low = max(1, int(first * 75) + 1 - self.BLOCK_MARGIN)
+        high = min(75, int(last * 75) + 1 + self.BLOCK_MARGIN)
+        
+        wanted = set(range(low, high + 1))
+        wanted.add(self.current_question_num)
+        
+        for q_num in list(self.question_widgets):
+            if q_num not in wanted:
+                self.destroy_question_block(q_num)
+        
+        for q_num in wanted:
+            self.ensure_question_block(q_num)
     
-    def create_question_block(self, parent, question_num, theme):
-        """Create a question block with category checklist and timer"""
-        # Main question frame
-        q_frame = tk.Frame(parent, bg=theme["bg"], bd=2, relief="solid")
-        q_frame.pack(fill="x", pady=5, padx=5)
+    def destroy_question_block(self, question_num):
+        """Destroy the widgets of a question block; its data stays in question_data"""
+        widgets = self.question_widgets.pop(question_num, None)
+        if widgets:
+            self.questions_canvas.delete(widgets["item"])
+            widgets["frame"].destroy()
+    
+    def ensure_question_block(self, question_num):
+        """Create the widgets for a question block if it is not already built"""
+        if question_num in self.question_widgets:
+            return
+        
+        theme = self._theme
+        q_data = self.question_data[question_num]
+        
+        # Main question frame, placed at the question's fixed slot in the canvas
+        q_frame = tk.Frame(self.questions_canvas, bg=theme["bg"], bd=2, relief="solid")
+        item = self.questions_canvas.create_window(
+            (5, (question_num - 1) * self.BLOCK_HEIGHT + 5),
+            window=q_frame,
+            anchor="nw",
+            height=self.BLOCK_HEIGHT - 10,
+            tags="question_block"
+        )
+        canvas_width = self.questions_canvas.winfo_width()
+        if canvas_width > 1:
+            self.questions_canvas.itemconfigure(item, width=canvas_width - 10)
+        
+        # Change-detection cache starts at the values the timer label is created with
+        widgets = {"frame": q_frame, "item": item, "category_vars": {}, "_last_fg": theme["fg"], "_last_text": "00:00"}
+        self.question_widgets[question_num] = widgets
         
         # Question header with colored tag
         header = tk.Frame(q_frame, bg=theme["bg"])
         header.pack(fill="x", padx=5, pady=5)
         
         # Question number label (will change color based on selection)
-        self.question_widgets[f"q{question_num}_label"] = tk.Label(
+        widgets["tag_label"] = tk.Label(
             header,
             text=f" Q{question_num} ",
             font=("Arial", 10, "bold"),
@@ -469,46 +632,34 @@ class MockTestTimerGUI:
             padx=8,
             pady=4
         )
-        self.question_widgets[f"q{question_num}_label"].pack(side="left", padx=5)
+        widgets["tag_label"].pack(side="left", padx=5)
         
         # Timer display for this question
-        timer_label = tk.Label(
+        widgets["timer_sv"] = tk.StringVar(value="00:00")
+        widgets["timer_label"] = tk.Label(
             header,
-            text="00:00",
+            textvariable=widgets["timer_sv"],
             font=("Arial", 10, "bold"),
             bg=theme["bg"],
             fg=theme["fg"],
             padx=8,
             pady=4
         )
-        timer_label.pack(side="left", padx=5)
+        widgets["timer_label"].pack(side="left", padx=5)
         
         # Category checklist
         checklist_frame = tk.Frame(q_frame, bg=theme["bg"])
         checklist_frame.pack(fill="x", padx=20, pady=5)
         
-        categories = ["Thinking", "Solving", "Applying", "Verification"]
-        category_colors = {"Thinking": "#FF6B6B", "Solving": "#4ECDC4", "Applying": "#45B7D1", "Verification": "#FFA07A"}
-        
-        self.question_data[question_num] = {
-            "categories": {},
-            "notes": "",
-            "time_spent": 0,
-            "timer_running": False,
-            "elapsed_seconds": 0,
-            "timer_label": timer_label,
-            "beep_played": False
-        }
-        
-        for category in categories:
-            var = tk.BooleanVar(value=False)
-            self.question_data[question_num]["categories"][category] = var
+        for category, checked in q_data["categories"].items():
+            var = tk.BooleanVar(value=checked)
+            widgets["category_vars"][category] = var
             
             cb = tk.Checkbutton(
                 checklist_frame,
                 text=category,
                 variable=var,
-                command=lambda qn=question_num: self.update_question_color(qn, theme)
+                command=partial(self.update_block_category, question_num, category)
             )
             cb.pack(side="left", padx=5)
         
@@ -517,27 +668,28 @@ class MockTestTimerGUI:
         details_frame.pack(fill="x", padx=20, pady=5)
         
         tk.Label(details_frame, text="Time (min):", bg=theme["bg"], fg=theme["fg"]).pack(side="left", padx=5)
-        time_var = tk.StringVar(value="0")
-        self.question_data[question_num]["time_var"] = time_var
+        time_var = tk.StringVar(value=q_data["time_spent"])
+        time_var.trace_add("write", lambda name, *args, qn=question_num: self.set_question_time_spent(qn, str(self.root.globalgetvar(name))))
+        widgets["time_var"] = time_var
         ttk.Entry(details_frame, textvariable=time_var, width=5).pack(side="left", padx=5)
         
         # Timer control buttons
         ttk.Button(
             details_frame,
             text="▶",
-            command=lambda qn=question_num: self.start_question_timer(qn)
+            command=partial(self.start_question_timer, question_num)
         ).pack(side="left", padx=2)
         
         ttk.Button(
             details_frame,
             text="⏸",
-            command=lambda qn=question_num: self.pause_question_timer(qn)
+            command=partial(self.pause_question_timer, question_num)
         ).pack(side="left", padx=2)
         
         ttk.Button(
             details_frame,
             text="⏹",
-            command=lambda qn=question_num: self.stop_question_timer(qn)
+            command=partial(self.stop_question_timer, question_num)
         ).pack(side="left", padx=2)
         
         # Notes section with templates
@@ -545,81 +697,182 @@ class MockTestTimerGUI:
         notes_section.pack(fill="x", padx=20, pady=5)
         
         tk.Label(notes_section, text="Notes:", bg=theme["bg"], fg=theme["fg"]).pack(side="left", padx=5)
-        notes_var = tk.StringVar()
-        self.question_data[question_num]["notes_var"] = notes_var
+        notes_var = tk.StringVar(value=q_data["notes"])
+        notes_var.trace_add("write", lambda name, *args, qd=q_data: qd.update(notes=str(self.root.globalgetvar(name))))
+        widgets["notes_var"] = notes_var
         notes_entry = ttk.Entry(notes_section, textvariable=notes_var, width=25)
         notes_entry.pack(side="left", padx=5)
         
         # Quick template buttons
-        templates = ["Maths", "Chemistry", "Physics", "Biology", "History"]
-        for template in templates:
+        for template in self._TEMPLATES:
             ttk.Button(
                 notes_section,
                 text=template,
                 width=8,
-                command=lambda t=template, nv=notes_var: nv.set(t)
+                command=partial(notes_var.set, template)
             ).pack(side="left", padx=2)
+        
+        # Restore state that was kept while the block was not built
+        self.update_question_color(question_num)
+        self.update_timer_display(question_num)
+    
+    def update_block_category(self, question_num, category):
+        """Update category in question data when checked in a question block"""
+        checked = self.question_widgets[question_num]["category_vars"][category].get()
+        self.set_question_category(question_num, category, checked)
     
-    def update_question_color(self, question_num, theme):
+    def set_question_category(self, question_num, category, checked):
+        """Record a category selection and refresh everything that displays it"""
+        self.question_data[question_num]["categories"][category] = checked
+        
+        widgets = self.question_widgets.get(question_num)
+        if widgets:
+            widgets["category_vars"][category].set(checked)
+        
+        self.update_question_color(question_num)
+        if question_num == self.current_question_num:
+            self.update_miniature_form(question_num)
+    
+    def set_question_time_spent(self, question_num, text):
+        """Record a manual time entry (minutes) and move the question's timer to match"""
+        q_data = self.question_data[question_num]
+        q_data["time_spent"] = text
+        
+        elapsed = self._elapsed[question_num]
+        if text == f"{elapsed / 60.0:.1f}":
+            return  # Entry already reflects the timer (e.g. written by stop_question_timer)
+        try:
+            new_elapsed = int(round(float(text) * 60))
+        except (ValueError, OverflowError):
+            return
+        if not 0 <= new_elapsed < 2**31:
+            return  # Outside what the per-question 'i' array can hold
+        
+        # Keep the running total in step with the edited question
+        self._total_elapsed_seconds += new_elapsed - elapsed
+        self._elapsed[question_num] = new_elapsed
+        if self._active_q == question_num:
+            self._q_t0[question_num] = time.monotonic() - new_elapsed
+        else:
+            self._q_t0[question_num] = self._q_paused_at[question_num] - new_elapsed
+        self.update_timer_display(question_num)
+        self.update_total_time_display()
+    
+    def update_question_color(self, question_num):
         """Update question tag color based on selected categories"""
         selected_categories = [
-            cat for cat, var in self.question_data[question_num]["categories"].items()
-            if var.get()
+            cat for cat, checked in self.question_data[question_num]["categories"].items()
+            if checked
         ]
         
-        # Color map
-        color_map = {
-            "Thinking": "#FF6B6B",
-            "Solving": "#4ECDC4",
-            "Applying": "#45B7D1",
-            "Verification": "#FFA07A"
-        }
-        
         if selected_categories:
             # Use first selected category color
-            bg_color = color_map.get(selected_categories[0], theme["accent"])
+            bg_color = self._CATEGORY_COLORS.get(selected_categories[0], self._theme["accent"])
         else:
-            bg_color = theme["accent"]
+            bg_color = self._theme["accent"]
         
-        label = self.question_widgets.get(f"q{question_num}_label")
-        if label:
-            label.config(bg=bg_color)
+        widgets = self.question_widgets.get(question_num)
+        if widgets:
+            widgets["tag_label"].config(bg=bg_color)
     
     def start_question_timer(self, question_num):
-        """Start timer for a specific question"""
-        if not self.question_data[question_num]["timer_running"]:
-            self.question_data[question_num]["timer_running"] = True
-            self.question_data[question_num]["beep_played"] = False
-            self.run_question_timer(question_num)
+        """Start timer for a specific question (pauses whichever question was running)"""
+        if self._active_q != question_num:
+            now = time.monotonic()
+            self._pause_active_question(now)
+            # Shift the question's start by the time it spent paused
+            self._q_t0[question_num] += now - self._q_paused_at[question_num]
+            self._active_q = question_num
+            self._beeped[question_num] = 0
+        
+        # The running question becomes the current one, so the miniature form and
+        # floating window (and their Pause/Stop buttons) follow it
+        if question_num != self.current_question_num:
+            self.update_miniature_form(question_num)
+            if self.mini_window and self.mini_window.winfo_exists():
+                self.refresh_floating_window()
+    
+    def _pause_active_question(self, now):
+        """Bring the running question's elapsed time up to date and pause it"""
+        question_num = self._active_q
+        if question_num is not None:
+            elapsed = int(now - self._q_t0[question_num])
+            self._total_elapsed_seconds += elapsed - self._elapsed[question_num]
+            self._elapsed[question_num] = elapsed
+            self._q_paused_at[question_num] = now
+            self._active_q = None
     
     def start_session_timer(self):
         """Start the overall session timer"""
-        self.session_timer_running = True
-        self.run_session_timer()
+        self._session_running = True
+        self._session_t0 = time.monotonic()
+        self._tick_id = self.root.after(1000, self._tick)
+    
+    def _cancel_pending(self):
+        """Cancel the tick and any other after() callbacks still pending for the session"""
+        if self._tick_id is not None:
+            self.root.after_cancel(self._tick_id)
+            self._tick_id = None
+        if self._block_refresh_id is not None:
+            self.root.after_cancel(self._block_refresh_id)
+            self._block_refresh_id = None
+        for after_id in self._after_ids:
+            self.root.after_cancel(after_id)
+        self._after_ids.clear()
     
-    def run_session_timer(self):
-        """Run the overall session timer and check if total time is reached"""
-        if self.session_timer_running and self.current_session:
-            self.session_elapsed_seconds += 1
+    def _tick(self):
+        """Single once-per-second tick driving the session and the active question timer"""
+        if not (self._session_running and self.current_session):
+            return
+        
+        # Elapsed times come from the monotonic clock, so late or stalled ticks never drift
+        now = time.monotonic()
+        session_elapsed = now - self._session_t0
+        self.session_elapsed_seconds = int(session_elapsed)
+        
+        # Check if total time exceeded
+        if self.session_elapsed_seconds >= self._total_deadline_sec:
+            self._session_running = False
+            self._pause_active_question(now)
+            self.end_test_automatically()
+            return
+        
+        question_num = self._active_q
+        if question_num is not None:
+            elapsed_arr = self._elapsed
+            beeped = self._beeped
+            
+            elapsed = int(now - self._q_t0[question_num])
+            self._total_elapsed_seconds += elapsed - elapsed_arr[question_num]
+            elapsed_arr[question_num] = elapsed
+            
+            # Check if time exceeded and play beep
+            if elapsed > self._max_seconds and not beeped[question_num]:
+                beeped[question_num] = 1
+                self._beep_q.put((1000, 500))  # 1000 Hz for 500 ms
             
-            # Check if total time exceeded
-            if self.session_elapsed_seconds >= (self.current_session.total_duration_minutes * 60):
-                self.session_timer_running = False
-                self.end_test_automatically()
-                return
+            self.update_timer_display(question_num)
+            self.update_total_time_display()
             
-            # Schedule next update
-            self.root.after(1000, self.run_session_timer)
+            # All label updates above are pending redraws; flush them together once
+            self.root.update_idletasks()
+        
+        # Schedule next update on the next whole second of the session clock
+        delay_ms = 1000 - int(session_elapsed % 1 * 1000)
+        self._tick_id = self.root.after(delay_ms, self._tick)
     
     def end_test_automatically(self):
         """Automatically end the test when time is up"""
-        self.session_timer_running = False
+        self._session_running = False
+        self._pause_active_question(time.monotonic())
+        self._cancel_pending()
         
         # Save all data
         try:
             self.save_all_questions()
         except:
             pass
+        self.close_log()
         
         # Show completion message
         msg = f"📋 THE PAPER HAS ENDED\n\n" \
@@ -635,23 +888,25 @@ class MockTestTimerGUI:
     
     def pause_question_timer(self, question_num):
         """Pause timer for a specific question"""
-        self.question_data[question_num]["timer_running"] = False
+        if self._active_q == question_num:
+            self._pause_active_question(time.monotonic())
+            self.update_timer_display(question_num)
     
     def stop_question_timer(self, question_num):
         """Stop timer and auto-start next question's timer"""
-        self.question_data[question_num]["timer_running"] = False
+        if self._active_q == question_num:
+            self._pause_active_question(time.monotonic())
         
         # Save the elapsed time to time_var in minutes
-        elapsed_seconds = self.question_data[question_num]["elapsed_seconds"]
+        elapsed_seconds = self._elapsed[question_num]
         elapsed_minutes = elapsed_seconds / 60.0
-        self.question_data[question_num]["time_var"].set(f"{elapsed_minutes:.1f}")
+        self.question_data[question_num]["time_spent"] = f"{elapsed_minutes:.1f}"
+        widgets = self.question_widgets.get(question_num)
+        if widgets:
+            widgets["time_var"].set(f"{elapsed_minutes:.1f}")
         
         self.update_timer_display(question_num)
-        
-        # Close current floating window
-        if self.mini_window and self.mini_window.winfo_exists():
-            self.mini_window.destroy()
-            self.mini_window = None
+        self.update_total_time_display()
         
         # Update miniature form to show next question
         next_question = question_num + 1
@@ -662,8 +917,8 @@ class MockTestTimerGUI:
             self.update_miniature_form(next_question)
             # Auto-start next question's timer
             self.start_question_timer(next_question)
-            # Create new floating window for next question
-            self.root.after(100, self.open_floating_window)
+            # Point the floating window at the next question
+            self.open_floating_window()
     
     def update_miniature_form(self, question_num):
         """Update the miniature status form for the current question"""
@@ -675,40 +930,22 @@ class MockTestTimerGUI:
             self.mini_question_label.config(text=f"Q{question_num}")
             
             # Update timer display to show current question's time
-            elapsed = q_data["elapsed_seconds"]
-            minutes = elapsed // 60
-            seconds = elapsed % 60
-            timer_text = f"{minutes:02d}:{seconds:02d}"
-            self.mini_timer_label.config(text=timer_text)
+            self._mini_timer_var.set(_format_mmss(self._elapsed[question_num]))
             
             # Update categories display
             selected_cats = [
-                cat for cat, var in q_data["categories"].items()
-                if var.get()
+                cat for cat, checked in q_data["categories"].items()
+                if checked
             ]
             cats_text = ", ".join(selected_cats) if selected_cats else "None"
             self.mini_categories_label.config(text=cats_text)
             
             # Update total time across all questions
             self.update_total_time_display()
-            
-            # Update floating window if it exists
-            if self.mini_window and self.mini_window.winfo_exists():
-                # Update floating window timer display
-                if self.mini_window_timer_label:
-                    self.mini_window_timer_label.config(text=timer_text)
     
     def update_total_time_display(self):
-        """Calculate and update total time spent on all questions"""
-        total_seconds = 0
-        for q_num in range(1, 76):
-            if q_num in self.question_data:
-                total_seconds += self.question_data[q_num]["elapsed_seconds"]
-        
-        total_minutes = total_seconds // 60
-        total_secs = total_seconds % 60
-        total_time_text = f"{total_minutes:02d}:{total_secs:02d}"
-        self.mini_total_time_label.config(text=total_time_text)
+        """Update total time spent on all questions from the running total"""
+        self._mini_total_var.set(_format_mmss(self._total_elapsed_seconds))
     
     def update_floating_category(self, question_num, category):
         """Update category in question data when checked in floating window"""
@@ -716,25 +953,22 @@ class MockTestTimerGUI:
             if category in self.question_data[question_num]["categories"]:
                 # Get the current state from floating window checkbox
                 current_state = self.floating_window_category_vars[category].get()
-                # Update the main question data
-                self.question_data[question_num]["categories"][category].set(current_state)
-                # Refresh the miniature display
-                self.update_miniature_form(question_num)
+                # Update the main question data and its displays
+                self.set_question_category(question_num, category, current_state)
     
     def open_floating_window(self):
-        """Open a floating window with timer controls"""
-        # Destroy old window if it exists
+        """Open a floating window with timer controls, reusing it if already open"""
         if self.mini_window and self.mini_window.winfo_exists():
-            self.mini_window.destroy()
+            self.refresh_floating_window()
+            return
         
         self.mini_window = tk.Toplevel(self.root)
-        self.mini_window.title(f"Question {self.current_question_num}")
         self.mini_window.geometry("450x320")
         self.mini_window.resizable(True, True)
         self.mini_window.attributes('-topmost', True)  # Keep on top
         
         # Get current theme
-        theme = self.themes.get(self.current_theme.get(), self.themes["Light"])
+        theme = self._theme
         self.mini_window.configure(bg=theme["bg"])
         
         # Categories checklist
@@ -749,29 +983,21 @@ class MockTestTimerGUI:
             fg=theme["fg"]
         ).pack(side="left", padx=5)
         
-        categories = ["Thinking", "Solving", "Applying", "Verification"]
         self.floating_window_category_vars = {}
+        self.floating_window_category_buttons = {}
         
-        # Initialize floating window checkboxes from main question data
-        for category in categories:
-            # Get the current state from main question data
-            if self.current_question_num in self.question_data:
-                if category in self.question_data[self.current_question_num]["categories"]:
-                    initial_value = self.question_data[self.current_question_num]["categories"][category].get()
-                else:
-                    initial_value = False
-            else:
-                initial_value = False
-            
-            var = tk.BooleanVar(value=initial_value)
+        # Checkbox states and commands are set per question by refresh_floating_window
+        for category in self._CATEGORIES:
+            var = tk.BooleanVar(value=False)
             self.floating_window_category_vars[category] = var
             
-            ttk.Checkbutton(
+            cb = ttk.Checkbutton(
                 categories_frame,
                 text=category,
-                variable=var,
-                command=lambda qn=self.current_question_num, cat=category: self.update_floating_category(qn, cat)
-            ).pack(side="left", padx=5)
+                variable=var
+            )
+            cb.pack(side="left", padx=5)
+            self.floating_window_category_buttons[category] = cb
         
         # Time info frame
         time_info_frame = tk.Frame(self.mini_window, bg=theme["bg"])
@@ -787,7 +1013,7 @@ class MockTestTimerGUI:
         
         self.floating_q_time_label = tk.Label(
             time_info_frame,
-            text="00:00",
+            textvariable=self._mini_timer_var,
             font=("Arial", 10, "bold"),
             bg=theme["bg"],
             fg=theme["accent"]
@@ -804,7 +1030,7 @@ class MockTestTimerGUI:
         
         self.floating_total_time_label = tk.Label(
             time_info_frame,
-            text="00:00",
+            textvariable=self._mini_total_var,
             font=("Arial", 10, "bold"),
             bg=theme["bg"],
             fg="#FF6B6B"
@@ -817,7 +1043,7 @@ class MockTestTimerGUI:
         
         self.mini_window_timer_label = tk.Label(
             timer_frame,
-            text="00:00",
+            textvariable=self._mini_timer_var,
             font=("Arial", 40, "bold"),
             bg=theme["bg"],
             fg=theme["accent"]
@@ -842,99 +1068,97 @@ class MockTestTimerGUI:
         
         # Position window at top right
         self.mini_window.geometry("+1200+50")
+        
+        self.refresh_floating_window()
     
-    def update_floating_window_timer(self, question_num, timer_text):
-        """Update the floating window timer display and time info"""
-        if self.mini_window and self.mini_window.winfo_exists():
-            # Update question timer
-            self.mini_window_timer_label.config(text=timer_text)
-            self.floating_q_time_label.config(text=timer_text)
-            
-            # Update total time
-            total_seconds = 0
-            for q_num in range(1, 76):
-                if q_num in self.question_data:
-                    total_seconds += self.question_data[q_num]["elapsed_seconds"]
-            
-            total_minutes = total_seconds // 60
-            total_secs = total_seconds % 60
-            total_time_text = f"{total_minutes:02d}:{total_secs:02d}"
-            self.floating_total_time_label.config(text=total_time_text)
-    
-    def run_question_timer(self, question_num):
-        """Run the timer in background"""
-        if self.question_data[question_num]["timer_running"]:
-            self.question_data[question_num]["elapsed_seconds"] += 1
-            
-            elapsed_minutes = self.question_data[question_num]["elapsed_seconds"] / 60
-            max_minutes = self.current_session.max_time_per_question
-            
-            # Check if time exceeded and play beep
-            if elapsed_minutes > max_minutes and not self.question_data[question_num]["beep_played"]:
-                self.question_data[question_num]["beep_played"] = True
-                try:
-                    winsound.Beep(1000, 500)  # 1000 Hz for 500 ms
-                except:
-                    pass
-            
-            self.update_timer_display(question_num)
-            
-            # Schedule next update
-            self.root.after(1000, self.run_question_timer, question_num)
+    def refresh_floating_window(self):
+        """Point the existing floating window at the current question"""
+        question_num = self.current_question_num
+        self.mini_window.title(f"Question {question_num}")
+        
+        # Initialize floating window checkboxes from main question data
+        categories = self.question_data[question_num]["categories"]
+        for category, var in self.floating_window_category_vars.items():
+            var.set(categories[category])
+            self.floating_window_category_buttons[category].configure(
+                command=partial(self.update_floating_category, question_num, category)
+            )
     
     def update_timer_display(self, question_num):
         """Update the timer display label"""
-        elapsed = self.question_data[question_num]["elapsed_seconds"]
-        minutes = elapsed // 60
-        seconds = elapsed % 60
-        
-        timer_text = f"{minutes:02d}:{seconds:02d}"
-        
-        # Change color if exceeded
-        max_minutes = self.current_session.max_time_per_question
-        elapsed_minutes = elapsed / 60
-        
-        if elapsed_minutes > max_minutes:
-            self.question_data[question_num]["timer_label"].config(fg="#FF6B6B")  # Red for exceeded
-        else:
-            self.question_data[question_num]["timer_label"].config(fg="#000000")  # Black for normal
-        
-        self.question_data[question_num]["timer_label"].config(text=timer_text)
+        elapsed = self._elapsed[question_num]
+        timer_text = _format_mmss(elapsed)
+        
+        widgets = self.question_widgets.get(question_num)
+        if widgets:
+            # Change color if exceeded: red for exceeded, the theme's text color for normal;
+            # only touch Tk when the value changes
+            new_fg = "#FF6B6B" if elapsed > self._max_seconds else self._theme["fg"]
+            if new_fg != widgets["_last_fg"]:
+                widgets["timer_label"].config(fg=new_fg)
+                widgets["_last_fg"] = new_fg
+            
+            if timer_text != widgets["_last_text"]:
+                widgets["timer_sv"].set(timer_text)
+                widgets["_last_text"] = timer_text
         
-        # Update floating window if it's for the current question
+        # Update miniature form and floating window if it's for the current question
         if question_num == self.current_question_num:
-            self.mini_timer_label.config(text=timer_text)
-            self.update_floating_window_timer(question_num, timer_text)
-            # Update total time display
-            self.update_total_time_display()
+            self._mini_timer_var.set(timer_text)
     
     def save_all_questions(self):
         """Save all question data to text file"""
         try:
-            with open(self.text_file, 'a') as f:
-                for q_num in range(1, 76):
-                    if q_num in self.question_data:
-                        q_data = self.question_data[q_num]
-                        selected_cats = [
-                            cat for cat, var in q_data["categories"].items()
-                            if var.get()
-                        ]
-                        
-                        time_spent = q_data.get("time_var", tk.StringVar()).get() or "0"
-                        notes = q_data.get("notes_var", tk.StringVar()).get() or ""
-                        beep_alert = "Yes" if q_data.get("beep_played", False) else "No"
-                        
-                        f.write(f"Question {q_num}:\n")
-                        f.write(f"  Categories: {', '.join(selected_cats) if selected_cats else 'None'}\n")
-                        f.write(f"  Time Spent: {time_spent} minutes\n")
-                        f.write(f"  Time Exceeded Alert: {beep_alert}\n")
-                        f.write(f"  Notes: {notes}\n")
-                        f.write(f"  Timestamp: {datetime.now().isoformat()}\n")
-                        f.write("-" * 40 + "\n\n")
+            ts = datetime.now().isoformat()
+            theme_name = self.current_theme.get()
+            parts = []
+            records = []
+            for q_num, q_data in sorted(self.question_data.items()):
+                selected_cats = [
+                    cat for cat, checked in q_data["categories"].items()
+                    if checked
+                ]
+                notes = q_data.get("notes") or ""
+                
+                # Skip questions the user never touched
+                if not (selected_cats or notes.strip() or self._elapsed[q_num] > 0):
+                    continue
                 
-                f.write("\n" + "="*80 + "\n")
-                f.write(f"Session ended: {datetime.now().isoformat()}\n")
-                f.write("="*80 + "\n")
+                cats_text = ", ".join(selected_cats) if selected_cats else "None"
+                time_spent = q_data.get("time_spent") or "0"
+                beep_alert = "Yes" if self._beeped[q_num] else "No"
+                
+                parts.append(f"Question {q_num}:\n")
+                parts.append(f"  Categories: {cats_text}\n")
+                parts.append(f"  Time Spent: {time_spent} minutes\n")
+                parts.append(f"  Time Exceeded Alert: {beep_alert}\n")
+                parts.append(f"  Notes: {notes}\n")
+                parts.append(f"  Timestamp: {ts}\n")
+                parts.append("-" * 40 + "\n\n")
+                
+                records.append(asdict(QuestionRecord(
+                    session_id=self.current_session.session_id,
+                    question_number=q_num,
+                    time_category=", ".join(selected_cats),
+                    allocated_time=self._max_seconds,
+                    actual_time=self._elapsed[q_num],
+                    timestamp=ts,
+                    theme=theme_name,
+                    notes=notes
+                )))
+            
+            # Machine-readable copy of the records, serialized in a single call
+            parts.append("QUESTION RECORDS (JSON)\n")
+            parts.append(_dumps_records(records))
+            
+            parts.append("\n" + "="*80 + "\n")
+            parts.append(f"Session ended: {ts}\n")
+            parts.append("="*80 + "\n")
+            
+            # One write into the buffered session handle, then one flush
+            f = self._log_fh
+            f.write("".join(parts))
+            f.flush()
             
             messagebox.showinfo("Success", f"All data saved to:\n\n{self.text_file.parent}\n\nFile: {self.text_file.name}")
         except Exception as e:
@@ -942,6 +1166,8 @@ class MockTestTimerGUI:
     
     def view_log_file(self):
         """Open the log file in default application"""
+        if self._log_fh is not None:
+            self._log_fh.flush()
         if self.text_file and self.text_file.exists():
             os.startfile(self.text_file)
         else:
@@ -949,9 +1175,12 @@ class MockTestTimerGUI:
     
     def end_session(self):
         """End the current session"""
-        self.session_timer_running = False  # Stop the session timer
         if messagebox.askyesno("Confirm", "Save all data and end session?"):
+            self._session_running = False  # Stop the session timer
+            self._pause_active_question(time.monotonic())
+            self._cancel_pending()
             self.save_all_questions()
+            self.close_log()
             # Show directory path
             msg = f"Session data saved at:\n\n{self.text_file}\n\nWould you like to start a new session?"
             if messagebox.askyesno("Session Ended", msg):
@@ -961,6 +1190,8 @@ class MockTestTimerGUI:
     
     def on_mousewheel(self, event):
         """Handle mouse wheel scrolling"""
+        if not (self.questions_canvas and self.questions_canvas.winfo_exists()):
+            return
         if event.num == 5 or event.delta < 0:
             self.questions_canvas.yview_scroll(3, "units")
         elif event.num == 4 or event.delta > 0:
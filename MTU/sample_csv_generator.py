@@ -45,26 +45,27 @@ def create_sample_csv():
     with open(csv_file, 'w', newline='') as f:
         writer = csv.writer(f)
         
-        # Write header section
-        writer.writerow(["Session Info", test_name, f"Started: {start_time.isoformat()}"])
-        writer.writerow([])  # Blank line
-        
-        # Write column headers
-        writer.writerow([
-            "Question #",
-            "Time Category",
-            "Allocated (min)",
-            "Actual (min)",
-            "Timestamp",
-            "Theme",
-            "Notes"
+        # Write header section, blank line and column headers in one call
+        writer.writerows([
+            ["Session Info", test_name, f"Started: {start_time.isoformat()}"],
+            [],  # Blank line
+            [
+                "Question #",
+                "Time Category",
+                "Allocated (min)",
+                "Actual (min)",
+                "Timestamp",
+                "Theme",
+                "Notes"
+            ]
         ])
         
-        # Write question data
+        # Build question rows, then write them together
+        rows = []
         current_time = start_time
         for q_num, category, allocated, actual, theme, notes in questions:
             current_time += timedelta(minutes=actual + 1)  # Add time for actual question
-            writer.writerow([
+            rows.append([
                 q_num,
                 category,
                 allocated,
@@ -73,6 +74,7 @@ def create_sample_csv():
                 theme,
                 notes
             ])
+        writer.writerows(rows)
     
     print(f"✓ Sample CSV created: {csv_file}")
     return csv_file
@@ -80,15 +82,18 @@ def create_sample_csv():
 def analyze_sample_csv():
     """Analyze the sample CSV and print statistics"""
     
-    import sys
+    csv_file = Path("mock_test_logs/mock_test_20240129_143000_SAMPLE.csv")
+    if not csv_file.exists():
+        print(f"\nSample CSV not found: {csv_file}")
+        return
+    
+    # pandas is slow to import, so only load it once there is a file to analyze
     try:
         import pandas as pd
         HAS_PANDAS = True
     except ImportError:
         HAS_PANDAS = False
     
-    csv_file = Path("mock_test_logs/mock_test_20240129_143000_SAMPLE.csv")
-    
     if HAS_PANDAS:
         # Read CSV, skipping the header rows
         df = pd.read_csv(csv_file, skiprows=2)
@@ -97,45 +102,55 @@ def analyze_sample_csv():
         print("SAMPLE TEST ANALYSIS")
         print("="*70)
         
+        # Pull the columns used repeatedly below out once
+        actual = df['Actual (min)']
+        allocated = df['Allocated (min)']
+        total_time = actual.sum()
+        
         print(f"\nTotal Questions: {len(df)}")
-        print(f"Total Time: {df['Actual (min)'].sum():.2f} minutes ({int(df['Actual (min)'].sum())} min)")
-        print(f"Average Time per Question: {df['Actual (min)'].mean():.2f} minutes")
-        print(f"Fastest Question: {df['Actual (min)'].min():.2f} minutes (Q#{df.loc[df['Actual (min)'].idxmin(), 'Question #']:.0f})")
-        print(f"Slowest Question: {df['Actual (min)'].max():.2f} minutes (Q#{df.loc[df['Actual (min)'].idxmax(), 'Question #']:.0f})")
+        print(f"Total Time: {total_time:.2f} minutes ({int(total_time)} min)")
+        print(f"Average Time per Question: {actual.mean():.2f} minutes")
+        print(f"Fastest Question: {actual.min():.2f} minutes (Q#{df.loc[actual.idxmin(), 'Question #']:.0f})")
+        print(f"Slowest Question: {actual.max():.2f} minutes (Q#{df.loc[actual.idxmax(), 'Question #']:.0f})")
         
         print("\n" + "-"*70)
         print("TIME BY CATEGORY")
         print("-"*70)
-        category_stats = df.groupby('Time Category')['Actual (min)'].agg(['count', 'sum', 'mean'])
-        category_stats.columns = ['Count', 'Total Time', 'Avg Time']
+        stat_funcs = ['count', 'sum', 'mean']
+        stat_names = ['Count', 'Total Time', 'Avg Time']
+        category_stats = actual.groupby(df['Time Category']).agg(stat_funcs)
+        category_stats.columns = stat_names
         print(category_stats.to_string())
         
         print("\n" + "-"*70)
         print("TIME BY THEME/SUBJECT")
         print("-"*70)
-        theme_stats = df.groupby('Theme')['Actual (min)'].agg(['count', 'sum', 'mean'])
-        theme_stats.columns = ['Count', 'Total Time', 'Avg Time']
+        theme_stats = actual.groupby(df['Theme']).agg(stat_funcs)
+        theme_stats.columns = stat_names
         print(theme_stats.to_string())
         
         print("\n" + "-"*70)
         print("TIME EFFICIENCY (Actual vs Allocated)")
         print("-"*70)
-        df['Difference'] = df['Actual (min)'] - df['Allocated (min)']
-        df['Efficiency %'] = (df['Allocated (min)'] / df['Actual (min)']) * 100
+        difference = actual - allocated
+        df['Difference'] = difference
+        df['Efficiency %'] = (allocated / actual) * 100
         efficiency_df = df[['Question #', 'Time Category', 'Theme', 'Allocated (min)', 'Actual (min)', 'Difference', 'Efficiency %']]
         print(efficiency_df.to_string(index=False))
         
         print("\n" + "-"*70)
         print("PERFORMANCE INSIGHTS")
         print("-"*70)
-        over_time = df[df['Actual (min)'] > df['Allocated (min)']]
+        # One comparison, reused (and inverted) for both the over and under statistics
+        over_mask = actual > allocated
+        over_time = difference[over_mask]
         print(f"Questions over allocated time: {len(over_time)}/{len(df)}")
-        print(f"Average time overage: {over_time['Difference'].mean():.2f} minutes")
+        print(f"Average time overage: {over_time.mean():.2f} minutes")
         
-        under_time = df[df['Actual (min)'] <= df['Allocated (min)']]
+        under_time = difference[~over_mask]
         if len(under_time) > 0:
             print(f"Questions within/under allocated time: {len(under_time)}/{len(df)}")
-            print(f"Average time saved: {abs(under_time['Difference'].mean()):.2f} minutes")
+            print(f"Average time saved: {abs(under_time.mean()):.2f} minutes")
         
         print("\n" + "="*70)
         